@@ -0,0 +1,203 @@
+from itertools import islice
+from typing import Dict, List, NamedTuple, Tuple
+
+import Config
+from Bootstrap import require_local_resources
+from Cache import content_digest, get_cache
+from Courses import ds_course, web_course, android_course, ios_course, uiux_course
+from Extractor import extract_pdf, parse_resume
+from Nlp import summary_docs
+from Sections import find_sections
+from Summarizer import rank_sentences
+from Taxonomy import get_taxonomy
+
+# Analysis logic shared by the Streamlit app, the batch CLI and anything else that
+# wants to score a resume. No st.* in here, analyze_resume() is the entry point.
+
+# purely local check, the data itself is fetched at deploy time by Bootstrap.py
+require_local_resources()
+
+
+# Summary module: the text goes through the pipeline a chunk at a time and stops as soon as
+# enough sentences are in (the summary itself for 'lead', the candidate cap for 'textrank'),
+# so its cost depends on where the good sentences are, not on resume length
+def _chunks(text, size=2000):
+    start = 0
+    while start < len(text):
+        # cut at a paragraph break if there's one soon after `size`, else at the next line break
+        end = text.find('\n\n', start + size, start + 2 * size)
+        if end < 0:
+            end = text.find('\n', start + size)
+        end = len(text) if end < 0 else end + 1
+        yield text[start:end]
+        start = end
+
+
+def _sentences(docs):
+    for doc in docs:
+        for sent in doc.sents:
+            # a wrapped line keeps its line break, which would cut the markdown bullet
+            yield ' '.join(sent.text.split())
+
+
+SUMMARY_MODES = ('lead', 'textrank')
+
+
+def resume_summary(resume_text, limit=Config.SUMMARY_SENTENCES, mode=None):
+    mode = mode or Config.SUMMARY_MODE
+    if mode not in SUMMARY_MODES:
+        raise ValueError(f"Unknown summary mode: {mode}")
+    try:
+        candidates = (sent for sent in _sentences(summary_docs(_chunks(resume_text))) if 40 < len(sent) < 200)
+        if mode == 'lead':
+            top_sentences = list(islice(candidates, limit))
+        else:
+            top_sentences = rank_sentences(list(islice(candidates, Config.SUMMARY_MAX_CANDIDATES)), limit)
+
+        # Format summary
+        summary = " **Summary Based on Resume Content:**\n"
+        for sent in top_sentences:
+            summary += f"- {sent}\n"
+
+        return summary
+    except Exception as e:
+        return f" Local summary error: {e}"
+
+
+# Resume ATS sections and their weight in the score
+SECTION_TIPS = {
+    "Objective": {"label": "Career Objective", "weight": 18},
+    "Achievements": {"label": "Achievements Section", "weight": 13},
+    "Projects": {"label": "Project Details", "weight": 18},
+    "Experience": {"label": "Work Experience", "weight": 20},
+    "Skills": {"label": "Technical or Soft Skills", "weight": 14},
+    "Certifications": {"label": "Certifications", "weight": 17}
+}
+
+
+# spans: find_sections() output, pass it in when the caller already has it
+def score_sections(resume_text, spans=None):
+    if spans is None:
+        spans = find_sections(resume_text)
+    score, sections = 0, []
+    for key, info in SECTION_TIPS.items():
+        present = key in spans
+        if present:
+            score += info["weight"]
+        sections.append((info["label"], present))
+    return score, sections
+
+
+def candidate_level(pages):
+    return "Fresher" if pages == 1 else "Intermediate" if pages == 2 else "Experienced"
+
+
+# Recommended field -> (skills to suggest, courses), fields as named in the skill taxonomy
+FIELD_RECOMMENDATIONS = {
+    "Data Science": (['Keras', 'TensorFlow', 'Pandas', 'Deep learning'], ds_course),
+    "Web Development": (['React js', 'Django', 'Backend', 'Cloud : AWS,Azure etc'], web_course),
+    "Android Development": (['Flutter', 'Kotlin', 'SQl-NoSQL', 'Git'], android_course),
+    "iOS Development": (['Swift', 'Xcode', 'TestFlight'], ios_course),
+    "UI/UX Design": (['Figma', 'Adobe XD', 'Creative thinking'], uiux_course),
+}
+
+
+def rank_fields(skill_lists, k=Config.FIELD_TOP_K, hit_counts=None):
+    """Career field scores for any number of resumes in one sparse product.
+
+    skill_lists holds one list of skill names (canonical or aliases) per resume. Returns the
+    (resumes x fields) score array and each resume's top k (field, score) pairs. hit_counts,
+    one Taxonomy.match_counts() dict per resume, breaks ties between equal scores.
+    """
+    taxonomy = get_taxonomy()
+    scores = taxonomy.field_scores(skill_lists)
+    hits = None if hit_counts is None else taxonomy.field_hits(hit_counts)
+    return scores, taxonomy.top_fields(scores, k, hits)
+
+
+# One row of scores as the Career Field Confidence chart wants it
+def field_confidence(scores):
+    return dict(zip(get_taxonomy().fields, scores.tolist()))
+
+
+# Best ranked field that has recommendations
+def recommend_field(top_fields):
+    for field, _ in top_fields:
+        if field in FIELD_RECOMMENDATIONS:
+            recommended_skills, courses = FIELD_RECOMMENDATIONS[field]
+            return field, recommended_skills, courses
+    return '', [], []
+
+
+class AnalysisResult(NamedTuple):
+    digest: str
+    text: str
+    resume_data: Dict
+    summary: str
+    score: int
+    sections: List[Tuple[str, bool]]
+    section_spans: Dict[str, Tuple[int, int]]
+    level: str
+    skills: List[str]
+    taxonomy_skills: List[str]
+    field_confidence: Dict[str, float]
+    top_fields: List[Tuple[str, float]]
+    predicted_field: str
+    recommended_skills: List[str]
+    courses: List[List[str]]
+
+
+def analyze_resume(data, use_cache=True, workers=None):
+    """Run the whole pipeline on the raw bytes (or a memoryview) of a PDF resume.
+
+    Finished analyses are cached by content hash, so re-uploads skip extraction and NLP.
+    workers is passed on to extract_pdf, use 1 when already inside a worker process.
+    """
+    digest = content_digest(data)
+    cached = get_cache().get(digest) if use_cache else None
+    if cached:
+        text, resume_data = cached['text'], cached['resume_data']
+        summary, score = cached['summary'], cached['score']
+        if cached.get('summary_mode') != Config.SUMMARY_MODE:
+            # the text is cached, only the summary needs redoing after a mode switch, once
+            summary = resume_summary(text)
+            cached.update(summary=summary, summary_mode=Config.SUMMARY_MODE)
+            get_cache().put(digest, cached)
+        spans = find_sections(text)
+        _, sections = score_sections(text, spans)
+    else:
+        # one pdfminer pass feeds both the parser and the scoring below
+        extracted = extract_pdf(data, workers=workers)
+        resume_data = parse_resume(extracted)
+        text = extracted.text
+        summary = resume_summary(text)
+        spans = find_sections(text)
+        score, sections = score_sections(text, spans)
+        if use_cache and resume_data:
+            get_cache().put(digest, {'text': text, 'resume_data': resume_data, 'summary': summary,
+                                     'summary_mode': Config.SUMMARY_MODE, 'score': score})
+
+    skills = resume_data.get('skills') or []
+    # canonical skills straight from the text, the parser's list is shown as extracted
+    hit_counts = get_taxonomy().match_counts(text)
+    taxonomy_skills = list(hit_counts)
+    # a skill counts once in the score, how often it comes up only settles ties
+    scores, top_fields = rank_fields([taxonomy_skills], hit_counts=[hit_counts])
+    field, recommended_skills, courses = recommend_field(top_fields[0])
+    return AnalysisResult(
+        digest=digest,
+        text=text,
+        resume_data=resume_data,
+        summary=summary,
+        score=score,
+        sections=sections,
+        section_spans=spans,
+        level=candidate_level(resume_data.get('no_of_pages', 0)),
+        skills=skills,
+        taxonomy_skills=taxonomy_skills,
+        field_confidence=field_confidence(scores[0]),
+        top_fields=top_fields[0],
+        predicted_field=field,
+        recommended_skills=recommended_skills,
+        courses=courses,
+    )
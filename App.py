@@ -1,27 +1,20 @@
 import streamlit as st
-import nltk
-import spacy
-import pandas as pd
 import base64
 import random
 import time
 import datetime
-from pyresparser import ResumeParser
-from pdfminer3.layout import LAParams
-from pdfminer3.pdfpage import PDFPage
-from pdfminer3.pdfinterp import PDFResourceManager, PDFPageInterpreter
-from pdfminer3.converter import TextConverter
-import io
+import os
+import uuid
 from streamlit_tags import st_tags
 from PIL import Image
-import pymysql
 from pytube import YouTube
 import plotly.express as px
-import os
+from Cache import content_digest
+from Analyzer import analyze_resume, FIELD_RECOMMENDATIONS
+from Database import insert_data, get_writer, fetch_user_page, category_counts, export_user_data, SORTS, EXPORT_FORMATS
+from UploadStore import save_upload_async
+from Courses import resume_videos, interview_videos
 
-
-nlp = spacy.load("en_core_web_sm")
-nltk.download('stopwords')
 # Frontend streamlit se bnaya
 st.set_page_config(page_title="Smart Resume Analyzer", layout="wide")
 theme = st.sidebar.radio("🌓 Select Theme", ["Light", "Dark"])
@@ -43,37 +36,8 @@ else:
         .stProgress > div > div > div > div { background-color: #0073e6; }
         </style>
     """, unsafe_allow_html=True)
-# Summary module
-def resume_summary(resume_text):
-    try:
-        doc = nlp(resume_text)
-        sentences = [sent.text.strip() for sent in doc.sents if 40 < len(sent.text.strip()) < 200]
-        top_sentences = sentences[:4] if len(sentences) >= 4 else sentences
-
-        # Format summary
-        summary = " **Summary Based on Resume Content:**\n"
-        for sent in top_sentences:
-            summary += f"- {sent}\n"
-
-        return summary
-    except Exception as e:
-        return f" Local summary error: {e}"
-
 #Chart module
-def show_field_confidence(resume_skills):
-    categories = {
-        "Data Science": ['tensorflow', 'keras', 'pytorch', 'machine learning', 'deep learning'],
-        "Web Development": ['react', 'django', 'php', 'laravel', 'html', 'css', 'javascript'],
-        "Android": ['flutter', 'kotlin', 'android'],
-        "iOS": ['swift', 'xcode', 'ios'],
-        "UI/UX": ['figma', 'xd', 'ux', 'wireframe', 'prototyping']
-    }
-
-    scores = {}
-    for field, keywords in categories.items():
-        match_count = sum(1 for skill in resume_skills if skill.lower() in keywords)
-        scores[field] = match_count
-
+def show_field_confidence(scores):
     fig = px.bar(
         x=list(scores.keys()),
         y=list(scores.values()),
@@ -101,22 +65,63 @@ def show_skill_radar(matched, missing):
     st.plotly_chart(fig)
 
 
-def pdf_reader(file_path):
-    resource_manager = PDFResourceManager()
-    output_string = io.StringIO()
-    converter = TextConverter(resource_manager, output_string, laparams=LAParams())
-    interpreter = PDFPageInterpreter(resource_manager, converter)
-    with open(file_path, 'rb') as fh:
-        for page in PDFPage.get_pages(fh, caching=True, check_extractable=True):
-            interpreter.process_page(page)
-    converter.close()
-    return output_string.getvalue()
-
-def show_pdf(file_path):
-    with open(file_path, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode('utf-8')
+def show_pdf(data):
+    base64_pdf = base64.b64encode(data).decode('utf-8')
     pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="100%" height="600"></iframe>'
     st.markdown(pdf_display, unsafe_allow_html=True)
+# Admin table: filtered, sorted and paged by MySQL, only one page is ever in memory
+def show_user_table():
+    col1, col2, col3 = st.columns(3)
+    fields = col1.multiselect("Field", list(FIELD_RECOMMENDATIONS))
+    levels = col2.multiselect("Level", ["Fresher", "Intermediate", "Experienced"])
+    sort = col3.selectbox("Sort by", list(SORTS))
+    col1, col2, col3 = st.columns(3)
+    min_score, max_score = col1.slider("Score", 0, 100, (0, 100))
+    today = datetime.date.today()
+    dates = ()
+    if col2.checkbox("Filter by upload date"):
+        dates = col2.date_input("Uploaded between", (today - datetime.timedelta(days=365), today))
+    page_size = col3.selectbox("Rows per page", [25, 50, 100, 200], index=1)
+
+    filters = {'fields': fields, 'levels': levels}
+    if (min_score, max_score) != (0, 100):
+        filters.update(min_score=min_score, max_score=max_score)
+    if len(dates) == 2:
+        filters.update(since=dates[0], until=dates[1] + datetime.timedelta(days=1))
+
+    # cursors of the pages visited so far, reset whenever the query changes
+    query = repr((filters, sort, page_size))
+    if st.session_state.get('admin_query') != query:
+        st.session_state['admin_query'] = query
+        st.session_state['admin_cursors'] = [None]
+    cursors = st.session_state['admin_cursors']
+
+    page, next_cursor = fetch_user_page(filters, sort, cursors[-1], page_size)
+    st.dataframe(page)
+    # callbacks run before the rerun, so the new page is fetched straight away
+    col1, col2, col3 = st.columns([1, 1, 4])
+    col1.button("Previous", disabled=len(cursors) == 1, on_click=cursors.pop)
+    col2.button("Next", disabled=next_cursor is None, on_click=cursors.append, args=(next_cursor,))
+    col3.caption(f"Page {len(cursors)}")
+    return filters
+
+
+# Export is built on demand, streamed from MySQL in chunks into a temp file. The download button
+# only shows on the run that prepared it: Streamlit keeps its own copy of the data until the session
+# ends, so the file is removed straight away and later reruns don't read it again
+def show_export():
+    col1, col2 = st.columns([1, 3])
+    fmt = col1.selectbox("Export format", EXPORT_FORMATS)
+    if col2.button("Prepare export"):
+        with st.spinner("Exporting user data..."):
+            path = export_user_data(fmt)
+        try:
+            with open(path, 'rb') as f:
+                st.download_button(f" Download {fmt}", f, file_name=f"User_Data.{fmt}", mime='application/octet-stream')
+        finally:
+            os.remove(path)
+
+
 def run():
     st.title(" Smart Resume Analyzer")
     st.sidebar.markdown("## Choose Role")
@@ -127,21 +132,24 @@ def run():
     st.image(img)
 
     if choice == 'Normal User':
-        os.makedirs('Uploaded_Resumes', exist_ok=True)
         pdf_file = st.file_uploader("📎 Upload Your Resume (PDF)", type=["pdf"])
         if pdf_file:
-            save_path = './Uploaded_Resumes/' + pdf_file.name
-            with open(save_path, "wb") as f:
-                f.write(pdf_file.getbuffer())
-            show_pdf(save_path)
-
-            resume_data = ResumeParser(save_path).get_extracted_data()
+            # zero-copy view of the upload, everything below works on it in memory
+            data = pdf_file.getbuffer()
+            digest = content_digest(data)
+            # widget interactions rerun the whole script, only a new upload is analysed again
+            analysis = st.session_state.get('analysis')
+            if analysis is None or analysis['digest'] != digest:
+                save_upload_async(pdf_file.name, data, digest)
+                analysis = {'digest': digest, 'result': analyze_resume(data), 'rendered': False}
+                st.session_state['analysis'] = analysis
+            show_pdf(data)
+
+            result = analysis['result']
+            resume_data, resume_score = result.resume_data, result.score
             if resume_data:
-                resume_text = pdf_reader(save_path)
-
                 st.subheader(" Resume Summary (Local NLP)")
-                summary = resume_summary(resume_text)
-                st.markdown(summary)
+                st.markdown(result.summary)
 
                 st.subheader(" Basic Info")
                 st.text("Name: " + resume_data.get('name', 'N/A'))
@@ -150,65 +158,32 @@ def run():
                 st.text("Pages: " + str(resume_data.get('no_of_pages', 'N/A')))
 
                 # === Candidate Level ===
-                pages = resume_data.get('no_of_pages', 0)
-                cand_level = "Fresher" if pages == 1 else "Intermediate" if pages == 2 else "Experienced"
+                cand_level = result.level
                 st.success(f" Candidate Level: {cand_level}")
 
 
                 st.subheader(" Extracted Skills")
-                extracted_skills = resume_data.get('skills', [])
+                extracted_skills = result.skills
                 st_tags(label="Your Skills", value=extracted_skills, key='skills')
 
                 st.subheader(" Career Field Confidence")
-                show_field_confidence(extracted_skills)
-
+                show_field_confidence(result.field_confidence)
 
-                from Courses import ds_course, web_course, android_course, ios_course, uiux_course, resume_videos, interview_videos
-
-                reco_field, recommended_skills, rec_course = '', [], []
-                ds_keywords = ['tensorflow', 'keras', 'pytorch', 'machine learning', 'deep learning']
-                web_keywords = ['react', 'django', 'php', 'laravel', 'html', 'css']
-                android_keywords = ['flutter', 'kotlin', 'android']
-                ios_keywords = ['swift', 'xcode', 'ios']
-                uiux_keywords = ['figma', 'xd', 'ux', 'wireframe']
 
                 def course_recommender(course_list):
                     st.subheader(" Recommended Courses")
                     rec_course = []
                     count = st.slider("Number of course recommendations:", 1, 10, 4)
-                    random.shuffle(course_list)
-                    for i, (name, link) in enumerate(course_list[:count]):
+                    # shuffle once per upload so the slider only changes how many are shown
+                    if 'courses' not in analysis:
+                        analysis['courses'] = random.sample(course_list, len(course_list))
+                    for i, (name, link) in enumerate(analysis['courses'][:count]):
                         st.markdown(f"**{i+1}. [{name}]({link})**")
                         rec_course.append(name)
                     return rec_course
 
-                for skill in extracted_skills:
-                    skill = skill.lower()
-                    if skill in ds_keywords:
-                        reco_field = "Data Science"
-                        recommended_skills = ['Keras', 'TensorFlow', 'Pandas','Deep learning']
-                        rec_course = course_recommender(ds_course)
-                        break
-                    elif skill in web_keywords:
-                        reco_field = "Web Development"
-                        recommended_skills = ['React js', 'Django', 'Backend', 'Cloud : AWS,Azure etc']
-                        rec_course = course_recommender(web_course)
-                        break
-                    elif skill in android_keywords:
-                        reco_field = "Android Development"
-                        recommended_skills = ['Flutter', 'Kotlin','SQl-NoSQL','Git']
-                        rec_course = course_recommender(android_course)
-                        break
-                    elif skill in ios_keywords:
-                        reco_field = "iOS Development"
-                        recommended_skills = ['Swift', 'Xcode','TestFlight']
-                        rec_course = course_recommender(ios_course)
-                        break
-                    elif skill in uiux_keywords:
-                        reco_field = "UI/UX Design"
-                        recommended_skills = ['Figma', 'Adobe XD','Creative thinking']
-                        rec_course = course_recommender(uiux_course)
-                        break
+                reco_field, recommended_skills = result.predicted_field, result.recommended_skills
+                rec_course = course_recommender(result.courses) if result.courses else []
 
 
                 st.subheader(" Recommended Skills")
@@ -223,35 +198,25 @@ def run():
                 # Resume ATS
                 st.subheader("📌 Resume Section Analysis & Suggestions")
 
-                resume_score = 0
-
-
-                tips = {
-                    "Objective": {"label": "Career Objective", "weight": 18},
-                    "Achievements": {"label": "Achievements Section", "weight": 13},
-                    "Projects": {"label": "Project Details", "weight": 18},
-                    "Experience": {"label": "Work Experience", "weight": 20},
-                    "Skills": {"label": "Technical or Soft Skills", "weight": 14},
-                    "Certifications": {"label": "Certifications", "weight": 17}
-                }
-
                 missing_sections = []
 
 
-                for key, info in tips.items():
-                    if key.lower() in resume_text.lower():
-                        resume_score += info["weight"]
-                        st.success(f" {info['label']} - Present")
+                for label, present in result.sections:
+                    if present:
+                        st.success(f" {label} - Present")
                     else:
-                        st.warning(f"️ {info['label']} - Not Found")
-                        missing_sections.append(info['label'])
+                        st.warning(f"️ {label} - Not Found")
+                        missing_sections.append(label)
 
                 #  progress bar
                 st.subheader(" Resume ATS Score")
-                my_bar = st.progress(0)
-                for i in range(resume_score):
-                    my_bar.progress(i + 1)
-                    time.sleep(0.005)
+                if analysis['rendered']:
+                    st.progress(resume_score)
+                else:
+                    my_bar = st.progress(0)
+                    for i in range(resume_score):
+                        my_bar.progress(i + 1)
+                        time.sleep(0.005)
 
                 st.success(f" Final Resume Score: **{resume_score} / 100**")
 
@@ -274,49 +239,31 @@ def run():
                 else:
                     st.error("️ Needs improvement. Add important sections to make your resume recruiter-friendly.")
 
-                # Database ka use hora h
-
-                def insert_data(name, email, res_score, timestamp, no_of_pages, reco_field, cand_level, skills, recommended_skills, courses):
-                    connection = pymysql.connect(host='localhost', user='root', password='')
-                    cursor = connection.cursor()
-                    cursor.execute("CREATE DATABASE IF NOT EXISTS SRA;")
-                    connection.select_db("sra")
-                    cursor.execute("""
-                        CREATE TABLE IF NOT EXISTS user_data (
-                            ID INT NOT NULL AUTO_INCREMENT,
-                            Name VARCHAR(100), Email_ID VARCHAR(50), resume_score VARCHAR(8),
-                            Timestamp VARCHAR(50), Page_no VARCHAR(5), Predicted_Field VARCHAR(25),
-                            User_level VARCHAR(30), Actual_skills VARCHAR(300),
-                            Recommended_skills VARCHAR(300), Recommended_courses VARCHAR(600),
-                            PRIMARY KEY (ID)
-                        );
-                    """)
-                    sql = "INSERT INTO user_data VALUES (0,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)"
-                    values = (name, email, res_score, timestamp, no_of_pages, reco_field,
-                              cand_level, skills, recommended_skills, courses)
-                    cursor.execute(sql, values)
-                    connection.commit()
-                    cursor.close()
-                    connection.close()
-
-                timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H:%M:%S')
-                insert_data(
-                    resume_data.get('name', ''),
-                    resume_data.get('email', ''),
-                    resume_score,
-                    timestamp,
-                    str(resume_data.get('no_of_pages', '')),
-                    reco_field,
-                    cand_level,
-                    str(extracted_skills),
-                    str(recommended_skills),
-                    str(rec_course)
-                )
+                # one user_data row per upload, not per rerun (the database enforces it too)
+                if not analysis['rendered']:
+                    timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    insert_data(
+                        resume_data.get('name', ''),
+                        resume_data.get('email', ''),
+                        resume_score,
+                        timestamp,
+                        resume_data.get('no_of_pages'),
+                        reco_field,
+                        cand_level,
+                        extracted_skills,
+                        recommended_skills,
+                        rec_course,
+                        resume_hash=result.digest,
+                        # same resume in the same session is one row, a refresh starts a new session
+                        session_id=st.session_state.setdefault('session_id', uuid.uuid4().hex)
+                    )
+                    analysis['videos'] = (random.choice(resume_videos), random.choice(interview_videos))
+                    analysis['rendered'] = True
 
 
                 st.subheader(" Resume & Interview Preparation")
-                st.video(random.choice(resume_videos))
-                st.video(random.choice(interview_videos))
+                st.video(analysis['videos'][0])
+                st.video(analysis['videos'][1])
 
             else:
                 st.error(" Could not extract resume data. Try another file.")
@@ -326,24 +273,23 @@ def run():
         st.header(" Admin Panel")
         user = st.text_input("Username")
         pwd = st.text_input("Password", type="password")
-        if st.button("Login") and user == "project_main" and pwd == "mlhub123":
-            connection = pymysql.connect(host='localhost', user='root', password='')
-            connection.select_db("sra")
-            df = pd.read_sql("SELECT * FROM user_data", connection)
-            st.dataframe(df)
-
-            def get_table_download_link(df, filename, text):
-                csv = df.to_csv(index=False)
-                b64 = base64.b64encode(csv.encode()).decode()
-                return f'<a href="data:file/csv;base64,{b64}" download="{filename}">{text}</a>'
+        # remembered across reruns, otherwise touching a filter would log the admin out
+        if st.button("Login"):
+            st.session_state['admin'] = user == "project_main" and pwd == "mlhub123"
+        if st.session_state.get('admin'):
+            writer = get_writer()
+            st.caption(f"Pending user_data writes: {writer.depth()}")
+            filters = show_user_table()
 
-            st.markdown(get_table_download_link(df, "User_Data.csv", " Download CSV"), unsafe_allow_html=True)
+            show_export()
 
             st.subheader(" Field Distribution")
-            st.plotly_chart(px.pie(df, names='Predicted_Field', title="Fields"))
+            fields = category_counts('Predicted_Field', filters)
+            st.plotly_chart(px.pie(fields, names='Value', values='Total', title="Fields"))
 
             st.subheader(" Experience Levels")
-            st.plotly_chart(px.pie(df, names='User_level', title="User Levels"))
+            levels = category_counts('User_level', filters)
+            st.plotly_chart(px.pie(levels, names='Value', values='Total', title="User Levels"))
         else:
             st.warning(" Enter correct admin credentials.")
 
@@ -0,0 +1,111 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+from Analyzer import analyze_resume, rank_fields
+
+# Headless scoring of a resume backlog, e.g.
+#   python Batch.py Uploaded_Resumes -o scores.jsonl -w 8
+# Successfully scored paths are appended to a checkpoint file (<output>.done by default) so a
+# rerun with the same arguments picks up where a crashed one stopped and retries the failures.
+#   python Batch.py --stored -o fields.jsonl
+# ranks the career fields of every resume already in user_data from its stored skills.
+
+
+def find_resumes(target):
+    pattern = os.path.join(target, '**', '*.pdf') if os.path.isdir(target) else target
+    return sorted(glob.glob(pattern, recursive=True))
+
+
+def analyze_file(path):
+    try:
+        with open(path, 'rb') as fh:
+            # already running inside a pool worker, so no nested page-parallel pool
+            result = analyze_resume(fh.read(), workers=1)
+        resume_data = result.resume_data
+        return {
+            'path': path,
+            'sha256': result.digest,
+            'name': resume_data.get('name'),
+            'email': resume_data.get('email'),
+            'mobile_number': resume_data.get('mobile_number'),
+            'pages': resume_data.get('no_of_pages'),
+            'level': result.level,
+            'skills': result.skills,
+            'taxonomy_skills': result.taxonomy_skills,
+            'field_confidence': result.field_confidence,
+            'top_fields': result.top_fields,
+            'predicted_field': result.predicted_field,
+            'recommended_skills': result.recommended_skills,
+            'score': result.score,
+            'missing_sections': [label for label, present in result.sections if not present],
+            'summary': result.summary,
+        }
+    except Exception as e:
+        return {'path': path, 'error': f"{type(e).__name__}: {e}"}
+
+
+def score_stored(out):
+    from Database import iter_user_skills
+    for chunk in iter_user_skills():
+        # one sparse product per chunk of stored resumes
+        _, top_fields = rank_fields([skills for _, skills in chunk])
+        for (user_id, _), top in zip(chunk, top_fields):
+            out.write(json.dumps({'id': user_id, 'top_fields': top}) + '\n')
+
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as fh:
+        return {line.rstrip('\n') for line in fh if line.strip()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory of resumes without the Streamlit UI")
+    parser.add_argument('target', nargs='?', help="directory (searched recursively) or glob pattern of PDFs")
+    parser.add_argument('--stored', action='store_true', help="rank the fields of the resumes in user_data instead")
+    parser.add_argument('-o', '--output', help="JSON lines file to append to, stdout if omitted")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument('--checkpoint', help="file of finished paths, defaults to <output>.done")
+    args = parser.parse_args(argv)
+    if args.stored:
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        try:
+            score_stored(out)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return
+    if not args.target:
+        parser.error("target is required unless --stored is given")
+
+    checkpoint = args.checkpoint or (args.output + '.done' if args.output else None)
+    done = load_checkpoint(checkpoint)
+    todo = [path for path in find_resumes(args.target) if path not in done]
+    print(f"{len(todo)} resumes to analyse, {len(done)} already done", file=sys.stderr)
+
+    out = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    ckpt = open(checkpoint, 'a', encoding='utf-8') if checkpoint else None
+    try:
+        with Pool(args.workers) as pool:
+            for record in pool.imap_unordered(analyze_file, todo):
+                # result first, checkpoint second: a crash in between repeats one line, never loses one
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+                # failures aren't checkpointed, a rerun retries them (a locked cache, a killed worker...)
+                if ckpt and 'error' not in record:
+                    ckpt.write(record['path'] + '\n')
+                    ckpt.flush()
+    finally:
+        if ckpt:
+            ckpt.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import importlib.util
+import os
+import sys
+
+import nltk
+
+import Config
+
+# Deploy-time check (and optional fetch) of the NLP data the app needs, e.g.
+#   python Bootstrap.py --download   # build step, the only place that touches the network
+#   python Bootstrap.py              # release step, fails the deploy if anything is missing
+# At runtime require_local_resources() only looks at the local filesystem.
+
+NLTK_RESOURCES = {'stopwords': 'corpora/stopwords'}
+
+if Config.NLTK_DATA not in nltk.data.path:
+    nltk.data.path.insert(0, Config.NLTK_DATA)
+
+
+def _has_nltk(path):
+    try:
+        nltk.data.find(path)
+        return True
+    except LookupError:
+        return False
+
+
+def _has_spacy_model(name):
+    return os.path.isdir(name) or importlib.util.find_spec(name) is not None
+
+
+def _has_pyresparser_model():
+    spec = importlib.util.find_spec('pyresparser')
+    if spec is None:
+        return False
+    return any(os.path.exists(os.path.join(location, 'meta.json')) for location in spec.submodule_search_locations)
+
+
+def missing_resources():
+    missing = [name for name, path in NLTK_RESOURCES.items() if not _has_nltk(path)]
+    if not _has_spacy_model(Config.SPACY_MODEL):
+        missing.append(Config.SPACY_MODEL)
+    if Config.PARSER_CUSTOM_NER and not _has_pyresparser_model():
+        missing.append('pyresparser')
+    return missing
+
+
+def require_local_resources():
+    missing = missing_resources()
+    if missing:
+        raise LookupError(f"Missing NLP resources {missing}, run `python Bootstrap.py --download` at deploy time")
+
+
+def download(missing):
+    for name in missing:
+        if name in NLTK_RESOURCES:
+            nltk.download(name, download_dir=Config.NLTK_DATA, quiet=True)
+        elif name == Config.SPACY_MODEL:
+            from spacy.cli import download as spacy_download
+            spacy_download(name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify the bundled NLTK/spaCy data before the app starts")
+    parser.add_argument('--download', action='store_true', help="fetch whatever is missing")
+    args = parser.parse_args(argv)
+
+    missing = missing_resources()
+    if missing and args.download:
+        download(missing)
+        missing = missing_resources()
+    if missing:
+        print(f"Missing NLP resources: {', '.join(missing)}", file=sys.stderr)
+        return 1
+    print("All NLP resources available locally")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
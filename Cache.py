@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import Config
+
+# Bump whenever extraction, parsing, summary or scoring output changes,
+# older entries are dropped the next time the cache is opened
+SCHEMA_VERSION = 8
+
+
+def content_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# Persistent LRU of finished analyses keyed by the SHA-256 of the uploaded PDF
+class AnalysisCache:
+    def __init__(self, path=Config.CACHE_PATH, max_entries=Config.CACHE_MAX_ENTRIES, version=SCHEMA_VERSION):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self.version = version
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                digest TEXT PRIMARY KEY, version INTEGER NOT NULL,
+                payload TEXT NOT NULL, last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS analysis_cache_last_used ON analysis_cache (last_used)")
+        self._conn.execute("DELETE FROM analysis_cache WHERE version != ?", (version,))
+
+    def get(self, digest):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM analysis_cache WHERE digest = ? AND version = ?",
+                (digest, self.version)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE analysis_cache SET last_used = ? WHERE digest = ?", (time.time(), digest))
+        return json.loads(row[0])
+
+    def put(self, digest, payload):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?, ?)",
+                (digest, self.version, json.dumps(payload), time.time()))
+            # evict least recently used entries beyond the budget
+            self._conn.execute("""
+                DELETE FROM analysis_cache WHERE digest IN (
+                    SELECT digest FROM analysis_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# Streamlit re-executes App.py on every rerun but modules stay imported, so this is once per process
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnalysisCache()
+    return _cache
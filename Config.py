@@ -0,0 +1,65 @@
+import os
+
+# Every knob can be overridden from the environment (Procfile / docker / CI)
+
+# Analysis cache
+CACHE_PATH = os.environ.get('SRA_CACHE_PATH', './.cache/analysis_cache.sqlite3')
+CACHE_MAX_ENTRIES = int(os.environ.get('SRA_CACHE_MAX_ENTRIES', '5000'))
+
+# PDF extraction: fan pages out to this many processes for documents of at least PARALLEL_MIN_PAGES pages
+EXTRACT_WORKERS = int(os.environ.get('SRA_EXTRACT_WORKERS', str(min(4, os.cpu_count() or 1))))
+PARALLEL_MIN_PAGES = int(os.environ.get('SRA_PARALLEL_MIN_PAGES', '3'))
+
+# NLP: SUMMARY_PIPELINE is 'sentencizer' (rule based, no model), 'parser' or 'full'
+SPACY_MODEL = os.environ.get('SRA_SPACY_MODEL', 'en_core_web_sm')
+SUMMARY_PIPELINE = os.environ.get('SRA_SUMMARY_PIPELINE', 'sentencizer')
+# sentences in the resume summary, SUMMARY_MODE 'lead' takes the first good ones, 'textrank' ranks
+# the first SUMMARY_MAX_CANDIDATES of them by TF-IDF centrality and novelty
+SUMMARY_SENTENCES = int(os.environ.get('SRA_SUMMARY_SENTENCES', '4'))
+SUMMARY_MODE = os.environ.get('SRA_SUMMARY_MODE', 'textrank')
+SUMMARY_MAX_CANDIDATES = int(os.environ.get('SRA_SUMMARY_MAX_CANDIDATES', '60'))
+
+# Skill taxonomy (canonical skills, aliases, fields) behind field confidence and recommendations
+TAXONOMY_PATH = os.environ.get('SRA_TAXONOMY_PATH', './skills_taxonomy.json')
+# how many ranked career fields an analysis reports
+FIELD_TOP_K = int(os.environ.get('SRA_FIELD_TOP_K', '3'))
+
+# Bundled NLTK data, filled once at deploy time by `python Bootstrap.py --download`
+NLTK_DATA = os.environ.get('NLTK_DATA', './nltk_data')
+# Also load pyresparser's custom NER model for degree/designation/companies (a second model per process)
+PARSER_CUSTOM_NER = os.environ.get('SRA_PARSER_CUSTOM_NER', '0') == '1'
+
+# Uploaded resumes: keep a copy of every upload on disk (written in the background)
+PERSIST_UPLOADS = os.environ.get('SRA_PERSIST_UPLOADS', '1') == '1'
+UPLOAD_DIR = os.environ.get('SRA_UPLOAD_DIR', './Uploaded_Resumes')
+# content-addressed store budget, least recently uploaded files go first (0 days = no age limit)
+UPLOAD_MAX_BYTES = int(os.environ.get('SRA_UPLOAD_MAX_BYTES', str(5 * 1024 ** 3)))
+UPLOAD_MAX_AGE_DAYS = float(os.environ.get('SRA_UPLOAD_MAX_AGE_DAYS', '365'))
+
+# Storage backend for user_data: 'mysql', or 'sqlite' for a single embedded file (CI, kiosks, load tests)
+DB_BACKEND = os.environ.get('SRA_DB_BACKEND', 'mysql').lower()
+SQLITE_PATH = os.environ.get('SRA_SQLITE_PATH', './.db/sra.sqlite3')
+
+# MySQL
+DB_HOST = os.environ.get('SRA_DB_HOST', 'localhost')
+DB_PORT = int(os.environ.get('SRA_DB_PORT', '3306'))
+DB_USER = os.environ.get('SRA_DB_USER', 'root')
+DB_PASSWORD = os.environ.get('SRA_DB_PASSWORD', '')
+DB_NAME = os.environ.get('SRA_DB_NAME', 'sra')
+# connections kept open per process, idle ones are pinged before reuse after this many seconds
+DB_POOL_SIZE = int(os.environ.get('SRA_DB_POOL_SIZE', '5'))
+DB_POOL_PING_AFTER = float(os.environ.get('SRA_DB_POOL_PING_AFTER', '30'))
+
+# Write-behind for user_data rows: flush every WRITE_BATCH_SIZE rows or WRITE_FLUSH_INTERVAL seconds
+WRITE_BATCH_SIZE = int(os.environ.get('SRA_WRITE_BATCH_SIZE', '100'))
+WRITE_FLUSH_INTERVAL = float(os.environ.get('SRA_WRITE_FLUSH_INTERVAL', '1.0'))
+# rows are spooled to this local file first, fsync'ed every SPOOL_FSYNC_EVERY rows or SPOOL_FSYNC_INTERVAL seconds
+SPOOL_PATH = os.environ.get('SRA_SPOOL_PATH', './.spool/user_data.jsonl')
+SPOOL_FSYNC_EVERY = int(os.environ.get('SRA_SPOOL_FSYNC_EVERY', '32'))
+SPOOL_FSYNC_INTERVAL = float(os.environ.get('SRA_SPOOL_FSYNC_INTERVAL', '0.5'))
+# `python Database.py convert-legacy` copies this many rows per batch, sleeping MIGRATION_PAUSE seconds in between
+MIGRATION_BATCH_SIZE = int(os.environ.get('SRA_MIGRATION_BATCH_SIZE', '1000'))
+MIGRATION_PAUSE = float(os.environ.get('SRA_MIGRATION_PAUSE', '0.05'))
+
+# Admin export: rows fetched per round trip while streaming user_data to disk
+EXPORT_CHUNK_SIZE = int(os.environ.get('SRA_EXPORT_CHUNK_SIZE', '5000'))
@@ -0,0 +1,739 @@
+import ast
+import csv
+import datetime
+import gzip
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import closing, contextmanager
+
+import pandas as pd
+import pymysql
+
+import Config
+from Spool import MAX_SLOTS, Spool, SpoolLocked, open_spool, slot_path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+log = logging.getLogger(__name__)
+
+# Database ka use hora h
+# Storage for analysis rows behind one small backend interface: MySQL for production, or
+# an embedded SQLite file (WAL mode) for CI, kiosks and load tests, picked by SRA_DB_BACKEND.
+# Everything above the backend (pool, spool-fed batched writer, admin queries) is shared.
+# The schema is created once per process, when the pool is first built (or at deploy time
+# with `python Database.py migrate`), so the hot path is a batched INSERT on an open connection.
+
+# Typed user_data: numbers and times as real columns, skills and courses in child tables,
+# indexes on everything the admin panel filters or groups by
+USER_DATA_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        ID INT NOT NULL AUTO_INCREMENT,
+        Name VARCHAR(100), Email_ID VARCHAR(50), resume_score SMALLINT,
+        Timestamp DATETIME, Page_no SMALLINT, Predicted_Field VARCHAR(25),
+        User_level VARCHAR(30), Row_id CHAR(32),
+        Resume_hash CHAR(64), Session_id VARCHAR(64) NOT NULL DEFAULT '',
+        PRIMARY KEY (ID), UNIQUE KEY user_data_row_id (Row_id),
+        UNIQUE KEY user_data_upload (Resume_hash, Session_id),
+        KEY user_data_field (Predicted_Field), KEY user_data_level (User_level),
+        KEY user_data_score (resume_score), KEY user_data_time (Timestamp)
+    )
+"""
+
+MYSQL_SCHEMA = [
+    USER_DATA_DDL.format(table='user_data'),
+    """
+    CREATE TABLE IF NOT EXISTS user_skills (
+        User_id INT NOT NULL, Kind VARCHAR(12) NOT NULL, Skill VARCHAR(100) NOT NULL,
+        PRIMARY KEY (User_id, Kind, Skill), KEY user_skills_skill (Skill)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_courses (
+        User_id INT NOT NULL, Course VARCHAR(200) NOT NULL,
+        PRIMARY KEY (User_id, Course)
+    )
+    """,
+    # row counts per Predicted_Field / User_level, kept up to date by insert_rows
+    """
+    CREATE TABLE IF NOT EXISTS user_data_rollup (
+        Dimension VARCHAR(16) NOT NULL, Value VARCHAR(30) NOT NULL, Total INT NOT NULL,
+        PRIMARY KEY (Dimension, Value)
+    )
+    """,
+]
+
+SQLITE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS user_data (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        Name TEXT, Email_ID TEXT, resume_score INTEGER,
+        Timestamp TIMESTAMP, Page_no INTEGER, Predicted_Field TEXT,
+        User_level TEXT, Row_id TEXT UNIQUE,
+        Resume_hash TEXT, Session_id TEXT NOT NULL DEFAULT ''
+    );
+    CREATE INDEX IF NOT EXISTS user_data_field ON user_data (Predicted_Field);
+    CREATE INDEX IF NOT EXISTS user_data_level ON user_data (User_level);
+    CREATE INDEX IF NOT EXISTS user_data_score ON user_data (resume_score);
+    CREATE INDEX IF NOT EXISTS user_data_time ON user_data (Timestamp);
+    CREATE TABLE IF NOT EXISTS user_skills (
+        User_id INTEGER NOT NULL, Kind TEXT NOT NULL, Skill TEXT NOT NULL,
+        PRIMARY KEY (User_id, Kind, Skill)
+    );
+    CREATE INDEX IF NOT EXISTS user_skills_skill ON user_skills (Skill);
+    CREATE TABLE IF NOT EXISTS user_courses (
+        User_id INTEGER NOT NULL, Course TEXT NOT NULL,
+        PRIMARY KEY (User_id, Course)
+    );
+    CREATE TABLE IF NOT EXISTS user_data_rollup (
+        Dimension TEXT NOT NULL, Value TEXT NOT NULL, Total INTEGER NOT NULL,
+        PRIMARY KEY (Dimension, Value)
+    );
+"""
+
+# rollup dimension -> user_data column
+ROLLUP_DIMENSIONS = {'Predicted_Field': 'Predicted_Field', 'User_level': 'User_level'}
+
+
+class MySQLBackend:
+    name = 'mysql'
+    insert_ignore = "INSERT IGNORE"
+    rollup_upsert = "ON DUPLICATE KEY UPDATE Total = Total + VALUES(Total)"
+    upload_upsert = "ON DUPLICATE KEY UPDATE Timestamp = VALUES(Timestamp)"
+
+    def sql(self, statement):
+        return statement
+
+    def group_concat(self, column):
+        return f"GROUP_CONCAT({column} SEPARATOR ', ')"
+
+    def connect(self, database=Config.DB_NAME):
+        return pymysql.connect(host=Config.DB_HOST, port=Config.DB_PORT, user=Config.DB_USER,
+                               password=Config.DB_PASSWORD, database=database)
+
+    def ping(self, connection):
+        connection.ping(reconnect=True)
+        return connection
+
+    def streaming_cursor(self, connection):
+        return connection.cursor(pymysql.cursors.SSCursor)
+
+    def column_type(self, cursor, table, column):
+        cursor.execute(
+            "SELECT DATA_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s", (Config.DB_NAME, table, column))
+        row = cursor.fetchone()
+        return row[0].lower() if row else None
+
+    def bootstrap(self):
+        connection = self.connect(database=None)
+        try:
+            with closing(connection.cursor()) as cursor:
+                cursor.execute(f"CREATE DATABASE IF NOT EXISTS {Config.DB_NAME}")
+                connection.select_db(Config.DB_NAME)
+                for statement in MYSQL_SCHEMA:
+                    cursor.execute(statement)
+                # user_data tables created before rows were spooled don't have Row_id yet
+                if self.column_type(cursor, 'user_data', 'Row_id') is None:
+                    cursor.execute("ALTER TABLE user_data ADD COLUMN Row_id CHAR(32), "
+                                   "ADD UNIQUE KEY user_data_row_id (Row_id)")
+                # nor the upload key, rows from before it keep a NULL hash and never collide
+                if self.column_type(cursor, 'user_data', 'Resume_hash') is None:
+                    cursor.execute("ALTER TABLE user_data ADD COLUMN Resume_hash CHAR(64), "
+                                   "ADD COLUMN Session_id VARCHAR(64) NOT NULL DEFAULT '', "
+                                   "ADD UNIQUE KEY user_data_upload (Resume_hash, Session_id)")
+                _ensure_rollup(cursor)
+            connection.commit()
+        finally:
+            connection.close()
+
+
+class SQLiteBackend:
+    name = 'sqlite'
+    insert_ignore = "INSERT OR IGNORE"
+    rollup_upsert = "ON CONFLICT (Dimension, Value) DO UPDATE SET Total = Total + excluded.Total"
+    upload_upsert = "ON CONFLICT (Resume_hash, Session_id) DO UPDATE SET Timestamp = excluded.Timestamp"
+
+    def __init__(self, path=Config.SQLITE_PATH):
+        self.path = path
+
+    def sql(self, statement):
+        return statement.replace('%s', '?')
+
+    def group_concat(self, column):
+        return f"GROUP_CONCAT({column}, ', ')"
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                                     detect_types=sqlite3.PARSE_DECLTYPES)
+        # WAL: readers (the admin panel) never block the writer thread and vice versa
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def ping(self, connection):
+        # a local file, nothing to reconnect
+        return connection
+
+    def streaming_cursor(self, connection):
+        # sqlite cursors already step through results row by row
+        return connection.cursor()
+
+    def bootstrap(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self.connect()
+        try:
+            connection.executescript(SQLITE_SCHEMA)
+            with closing(connection.cursor()) as cursor:
+                cursor.execute("PRAGMA table_info(user_data)")
+                if 'Resume_hash' not in {row[1] for row in cursor.fetchall()}:
+                    cursor.execute("ALTER TABLE user_data ADD COLUMN Resume_hash TEXT")
+                    cursor.execute("ALTER TABLE user_data ADD COLUMN Session_id TEXT NOT NULL DEFAULT ''")
+                cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS user_data_upload ON user_data (Resume_hash, Session_id)")
+                _ensure_rollup(cursor)
+            connection.commit()
+        finally:
+            connection.close()
+
+
+BACKENDS = {'mysql': MySQLBackend, 'sqlite': SQLiteBackend}
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        if Config.DB_BACKEND not in BACKENDS:
+            raise ValueError(f"Unknown SRA_DB_BACKEND {Config.DB_BACKEND!r}, expected one of {sorted(BACKENDS)}")
+        _backend = BACKENDS[Config.DB_BACKEND]()
+    return _backend
+
+
+# Statements below are written once with %s placeholders, the backend adapts them
+def _execute(cursor, statement, params=()):
+    cursor.execute(get_backend().sql(statement), params)
+
+
+def _executemany(cursor, statement, rows):
+    if rows:
+        cursor.executemany(get_backend().sql(statement), rows)
+
+
+def _read_sql(connection, statement, params=()):
+    return pd.read_sql(get_backend().sql(statement), connection, params=list(params))
+
+
+def migrate():
+    get_backend().bootstrap()
+
+
+def _ensure_rollup(cursor):
+    _execute(cursor, "SELECT COUNT(*) FROM user_data_rollup")
+    if not cursor.fetchone()[0]:
+        _rebuild_rollup(cursor)
+
+
+def _rebuild_rollup(cursor):
+    _execute(cursor, "DELETE FROM user_data_rollup")
+    for dimension, column in ROLLUP_DIMENSIONS.items():
+        _execute(cursor, f"""
+            INSERT INTO user_data_rollup (Dimension, Value, Total)
+            SELECT %s, COALESCE({column}, ''), COUNT(*) FROM user_data GROUP BY COALESCE({column}, '')
+        """, (dimension,))
+
+
+def rebuild_rollup():
+    with get_pool().connection() as connection:
+        with closing(connection.cursor()) as cursor:
+            _rebuild_rollup(cursor)
+        connection.commit()
+
+
+# Rows come either from the app (lists, ISO timestamps) or from the old VARCHAR layout
+# (str(list) blobs, '%Y-%m-%d_%H:%M:%S' timestamps), both end up typed
+def _parse_list(value):
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    try:
+        parsed = ast.literal_eval(value or '[]')
+    except (ValueError, SyntaxError):
+        return []
+    return list(parsed) if isinstance(parsed, (list, tuple)) else []
+
+
+def _parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_time(value):
+    if isinstance(value, datetime.datetime):
+        return value
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d_%H:%M:%S'):
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def _typed_row(name, email, score, timestamp, pages, field, level, skills, recommended_skills, courses):
+    parent = (name, email, _parse_int(score), _parse_time(timestamp), _parse_int(pages), field, level)
+    return parent, (_parse_list(skills), _parse_list(recommended_skills), _parse_list(courses))
+
+
+def _insert_children(cursor, children):
+    skills, courses = [], []
+    for user_id, (actual, recommended, rec_courses) in children:
+        skills += [(user_id, 'actual', str(skill)[:100]) for skill in actual]
+        skills += [(user_id, 'recommended', str(skill)[:100]) for skill in recommended]
+        courses += [(user_id, str(course)[:200]) for course in rec_courses]
+    insert_ignore = get_backend().insert_ignore
+    _executemany(cursor, f"{insert_ignore} INTO user_skills (User_id, Kind, Skill) VALUES (%s,%s,%s)", skills)
+    _executemany(cursor, f"{insert_ignore} INTO user_courses (User_id, Course) VALUES (%s,%s)", courses)
+
+
+# bootstrap() gives the legacy table the Row_id and upload key columns too, the app writes them there
+LEGACY_COLUMNS = ("ID, Name, Email_ID, resume_score, Timestamp, Page_no, Predicted_Field, User_level, "
+                  "Actual_skills, Recommended_skills, Recommended_courses, Row_id, Resume_hash, Session_id")
+TYPED_COLUMNS = ("ID, Name, Email_ID, resume_score, Timestamp, Page_no, Predicted_Field, User_level, "
+                 "Row_id, Resume_hash, Session_id")
+
+
+def _copy_legacy_batch(cursor, source, target, after_id, limit):
+    cursor.execute(f"SELECT {LEGACY_COLUMNS} FROM {source} WHERE ID > %s ORDER BY ID LIMIT %s", (after_id, limit))
+    rows = cursor.fetchall()
+    parents, children = [], []
+    for row in rows:
+        parent, lists = _typed_row(*row[1:11])
+        parents.append((row[0],) + parent + (row[11], row[12], row[13] or ''))
+        children.append((row[0], lists))
+    placeholders = ','.join(['%s'] * 11)
+    cursor.executemany(f"INSERT IGNORE INTO {target} ({TYPED_COLUMNS}) VALUES ({placeholders})", parents)
+    _insert_children(cursor, children)
+    return (rows[-1][0] if rows else after_id), len(rows)
+
+
+def convert_legacy(batch_size=Config.MIGRATION_BATCH_SIZE, pause=Config.MIGRATION_PAUSE):
+    """Online conversion of a VARCHAR-era user_data table to the typed schema.
+
+    Rows are copied in primary-key order, batch_size at a time with a commit and a short
+    pause after each batch, so the live table is never locked. Then the tables are swapped
+    with one atomic RENAME, and the old one is kept as user_data_legacy. Safe to rerun,
+    it carries on from the last copied ID.
+    """
+    backend = get_backend()
+    if not isinstance(backend, MySQLBackend):
+        # only MySQL installs ever had the VARCHAR layout
+        return 0
+    backend.bootstrap()
+    connection = backend.connect()
+    try:
+        with closing(connection.cursor()) as cursor:
+            if backend.column_type(cursor, 'user_data', 'resume_score') != 'varchar':
+                return 0
+            cursor.execute(USER_DATA_DDL.format(table='user_data_typed'))
+            cursor.execute("SELECT COALESCE(MAX(ID), 0) FROM user_data_typed")
+            last_id, copied, total = cursor.fetchone()[0], batch_size, 0
+            while copied == batch_size:
+                last_id, copied = _copy_legacy_batch(cursor, 'user_data', 'user_data_typed', last_id, batch_size)
+                connection.commit()
+                total += copied
+                time.sleep(pause)
+
+            # leave an ID gap so rows the app writes while we swap can still be copied with their own IDs
+            cursor.execute("SELECT COALESCE(MAX(ID), 0) FROM user_data")
+            cursor.execute(f"ALTER TABLE user_data_typed AUTO_INCREMENT = {cursor.fetchone()[0] + 100000}")
+            cursor.execute("RENAME TABLE user_data TO user_data_legacy, user_data_typed TO user_data")
+            copied = batch_size
+            while copied:
+                last_id, copied = _copy_legacy_batch(cursor, 'user_data_legacy', 'user_data', last_id, batch_size)
+                connection.commit()
+                total += copied
+        return total
+    finally:
+        connection.close()
+
+
+class ConnectionPool:
+    def __init__(self, backend, size=Config.DB_POOL_SIZE, ping_after=Config.DB_POOL_PING_AFTER):
+        self.backend = backend
+        self.ping_after = ping_after
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self.backend.connect()
+            else:
+                # health check only for connections that sat idle long enough to have been dropped
+                if time.monotonic() - last_used > self.ping_after:
+                    conn = self.backend.ping(conn)
+            try:
+                yield conn
+                # end the transaction a read left open (connections aren't autocommit), so the next
+                # caller gets a fresh snapshot and no metadata lock on user_data outlives the request
+                conn.rollback()
+            except BaseException:
+                # don't hand a connection in an unknown state to the next caller (this includes
+                # a streaming generator abandoned halfway through its result set)
+                conn.close()
+                raise
+            self._idle.put((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            backend = get_backend()
+            backend.bootstrap()
+            _pool = ConnectionPool(backend)
+    return _pool
+
+
+# Upsert keyed by (Resume_hash, Session_id): the same resume analysed again in the same
+# session only moves its Timestamp, so write volume tracks distinct uploads. IGNORE: a
+# replayed row whose Row_id is already there is skipped, and (on MySQL) a bad value is
+# truncated with a warning instead of wedging the spool on one row forever.
+INSERT_SQL = """
+    {insert_ignore} INTO user_data (Name, Email_ID, resume_score, Timestamp, Page_no, Predicted_Field, User_level,
+                                    Resume_hash, Session_id, Row_id)
+    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s) {upload_upsert}
+"""
+
+
+# rows are (name, email, score, timestamp, pages, field, level, skills, recommended_skills, courses,
+# resume_hash, session_id, row_id), rows spooled before the upload key have no hash or session
+def insert_rows(rows):
+    parents, children = [], {}
+    for row in rows:
+        values, row_id = row[:-1], row[-1]
+        resume_hash, session_id = (values[10:] + (None, ''))[:2]
+        parent, lists = _typed_row(*values[:10])
+        parents.append(parent + (resume_hash, session_id or '', row_id))
+        children[row_id] = lists
+    placeholders = ','.join(['%s'] * len(children))
+    backend = get_backend()
+    with get_pool().connection() as connection:
+        with closing(connection.cursor()) as cursor:
+            # rows replayed from the spool may already be there, they must not count twice in the rollup
+            _execute(cursor, f"SELECT Row_id FROM user_data WHERE Row_id IN ({placeholders})", list(children))
+            existing = {row[0] for row in cursor.fetchall()}
+            new_parents = [parent for parent in parents if parent[-1] not in existing]
+            _executemany(cursor, INSERT_SQL.format(insert_ignore=backend.insert_ignore,
+                                                   upload_upsert=backend.upload_upsert), new_parents)
+            # a row that hit the upload key never got its Row_id stored: no children, no rollup
+            _execute(cursor, f"SELECT Row_id, ID FROM user_data WHERE Row_id IN ({placeholders})", list(children))
+            ids = dict(cursor.fetchall())
+            _insert_children(cursor, [(ids[row_id], lists) for row_id, lists in children.items() if row_id in ids])
+            _bump_rollup(cursor, [parent for parent in new_parents if parent[-1] in ids])
+        connection.commit()
+
+
+def _bump_rollup(cursor, parents):
+    # parent tuples are (name, email, score, time, pages, field, level, resume_hash, session_id, row_id)
+    counts = Counter()
+    for parent in parents:
+        counts['Predicted_Field', parent[5] or ''] += 1
+        counts['User_level', parent[6] or ''] += 1
+    _executemany(
+        cursor,
+        f"INSERT INTO user_data_rollup (Dimension, Value, Total) VALUES (%s,%s,%s) {get_backend().rollup_upsert}",
+        [(dimension, value, total) for (dimension, value), total in counts.items()])
+
+
+# Write-behind for user_data: rows go to the local spool first, then a background thread
+# drains it with executemany once batch_size rows are waiting or flush_interval seconds
+# have passed. The backlog lives on disk, so memory stays flat and a DB outage only means
+# the spool grows until the database is reachable again.
+class BackgroundWriter:
+    def __init__(self, spool, batch_size=Config.WRITE_BATCH_SIZE, flush_interval=Config.WRITE_FLUSH_INTERVAL):
+        self.spool = spool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='user_data-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        self.spool.append(row)
+        if self.spool.backlog() >= self.batch_size:
+            self._wake.set()
+
+    def depth(self):
+        return self.spool.backlog()
+
+    def _run(self):
+        delay = 1
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.spool.replay(insert_rows, self.batch_size)
+                delay = 1
+            except Exception:
+                log.exception("Draining the user_data spool failed, %d rows waiting, retrying in %ds",
+                              self.spool.backlog(), delay)
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            # whatever an earlier process left in the spool is drained on the first pass
+            _writer = BackgroundWriter(
+                open_spool(Config.SPOOL_PATH, Config.SPOOL_FSYNC_EVERY, Config.SPOOL_FSYNC_INTERVAL))
+    return _writer
+
+
+def insert_data(name, email, res_score, timestamp, no_of_pages, reco_field, cand_level, skills, recommended_skills, courses,
+                resume_hash=None, session_id=''):
+    values = (name, email, res_score, timestamp, no_of_pages, reco_field,
+              cand_level, skills, recommended_skills, courses, resume_hash, session_id)
+    get_writer().submit(values)
+
+
+def _user_data_query():
+    group_concat = get_backend().group_concat
+    return f"""
+        SELECT u.ID, u.Name, u.Email_ID, u.resume_score, u.Timestamp, u.Page_no, u.Predicted_Field, u.User_level,
+            (SELECT {group_concat('Skill')} FROM user_skills s
+             WHERE s.User_id = u.ID AND s.Kind = 'actual') AS Actual_skills,
+            (SELECT {group_concat('Skill')} FROM user_skills s
+             WHERE s.User_id = u.ID AND s.Kind = 'recommended') AS Recommended_skills,
+            (SELECT {group_concat('Course')} FROM user_courses c WHERE c.User_id = u.ID) AS Recommended_courses
+        FROM user_data u
+    """
+
+
+# Export: user_data is streamed from an unbuffered cursor, chunk_size rows at a
+# time, into a gzip'd CSV or a Parquet file on disk, so memory is one chunk whatever the table size
+EXPORT_FORMATS = ['csv.gz'] + (['parquet'] if pq is not None else [])
+
+
+def _export_chunks(chunk_size):
+    with get_pool().connection() as connection:
+        with closing(get_backend().streaming_cursor(connection)) as cursor:
+            _execute(cursor, _user_data_query() + " ORDER BY u.ID")
+            columns = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    return
+                yield columns, rows
+
+
+# Actual skills of every stored row for bulk rescoring: lists of up to chunk_size
+# (ID, [skills]) pairs, streamed like the export
+def iter_user_skills(chunk_size=Config.EXPORT_CHUNK_SIZE):
+    with get_pool().connection() as connection:
+        with closing(get_backend().streaming_cursor(connection)) as cursor:
+            _execute(cursor, "SELECT User_id, Skill FROM user_skills WHERE Kind = 'actual' ORDER BY User_id")
+            batch, current, skills = [], None, []
+            for user_id, skill in cursor:
+                if user_id != current:
+                    if current is not None:
+                        batch.append((current, skills))
+                        if len(batch) == chunk_size:
+                            yield batch
+                            batch = []
+                    current, skills = user_id, []
+                skills.append(skill)
+            if current is not None:
+                batch.append((current, skills))
+            if batch:
+                yield batch
+
+
+def _write_csv(path, chunks):
+    with gzip.open(path, 'wt', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out)
+        header_written = False
+        for columns, rows in chunks:
+            if not header_written:
+                writer.writerow(columns)
+                header_written = True
+            writer.writerows(rows)
+
+
+PARQUET_TYPES = {'ID': 'int64', 'resume_score': 'int64', 'Page_no': 'int64', 'Timestamp': 'timestamp'}
+
+
+def _write_parquet(path, chunks):
+    writer = None
+    try:
+        for columns, rows in chunks:
+            if writer is None:
+                # fixed schema, a chunk of all-NULL values must not change a column's type
+                schema = pa.schema([
+                    (name, pa.timestamp('s') if PARQUET_TYPES.get(name) == 'timestamp'
+                     else pa.int64() if name in PARQUET_TYPES else pa.string())
+                    for name in columns])
+                writer = pq.ParquetWriter(path, schema)
+            data = {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def export_user_data(fmt='csv.gz', directory=None, chunk_size=Config.EXPORT_CHUNK_SIZE):
+    """Write the whole user_data table to a temp file and return its path."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    fd, path = tempfile.mkstemp(prefix='User_Data_', suffix='.' + fmt, dir=directory)
+    os.close(fd)
+    try:
+        if fmt == 'parquet':
+            _write_parquet(path, _export_chunks(chunk_size))
+        else:
+            _write_csv(path, _export_chunks(chunk_size))
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+# Admin charts: counts per category. Unfiltered they come straight from the rollup table,
+# O(categories) whatever the history size, filtered ones are a GROUP BY on the indexed columns.
+def category_counts(dimension, filters=None):
+    clauses, params = _filter_sql(**(filters or {}))
+    if clauses:
+        column = ROLLUP_DIMENSIONS[dimension]
+        sql = (f"SELECT COALESCE(u.{column}, '') AS Value, COUNT(*) AS Total FROM user_data u "
+               f"WHERE {' AND '.join(clauses)} GROUP BY COALESCE(u.{column}, '')")
+    else:
+        sql = "SELECT Value, Total FROM user_data_rollup WHERE Dimension = %s AND Total > 0"
+        params = [dimension]
+    with get_pool().connection() as connection:
+        return _read_sql(connection, sql, params)
+
+
+# Admin table sort options -> (column, direction), ID breaks ties and doubles as upload order
+SORTS = {
+    'Newest': ('ID', 'DESC'),
+    'Oldest': ('ID', 'ASC'),
+    'Highest score': ('resume_score', 'DESC'),
+    'Lowest score': ('resume_score', 'ASC'),
+}
+
+
+def _filter_sql(fields=None, levels=None, min_score=None, max_score=None, since=None, until=None):
+    clauses, params = [], []
+    if fields:
+        clauses.append(f"u.Predicted_Field IN ({','.join(['%s'] * len(fields))})")
+        params += list(fields)
+    if levels:
+        clauses.append(f"u.User_level IN ({','.join(['%s'] * len(levels))})")
+        params += list(levels)
+    if min_score is not None:
+        clauses.append("u.resume_score >= %s")
+        params.append(min_score)
+    if max_score is not None:
+        clauses.append("u.resume_score <= %s")
+        params.append(max_score)
+    if since is not None:
+        clauses.append("u.Timestamp >= %s")
+        params.append(since)
+    if until is not None:
+        clauses.append("u.Timestamp < %s")
+        params.append(until)
+    return clauses, params
+
+
+def fetch_user_page(filters, sort='Newest', after=None, limit=50):
+    """One page of the admin table, filtered and sorted by the database.
+
+    Keyset pagination: after is the (sort value, ID) of the last row of the previous page,
+    so every page is an index range scan of `limit` rows however deep it is. Returns the
+    page and the cursor for the next one (None on the last page).
+    """
+    column, direction = SORTS[sort]
+    clauses, params = _filter_sql(**filters)
+    if column != 'ID':
+        # a keyset can't step past NULLs, unscored legacy rows only show up in the ID sorts
+        clauses.append(f"u.{column} IS NOT NULL")
+    if after is not None:
+        op = '<' if direction == 'DESC' else '>'
+        if column == 'ID':
+            clauses.append(f"u.ID {op} %s")
+            params.append(after[1])
+        else:
+            clauses.append(f"(u.{column} {op} %s OR (u.{column} = %s AND u.ID {op} %s))")
+            params += [after[0], after[0], after[1]]
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"{_user_data_query()} {where} ORDER BY u.{column} {direction}, u.ID {direction} LIMIT %s"
+    with get_pool().connection() as connection:
+        page = _read_sql(connection, sql, params + [limit])
+    if len(page) < limit:
+        return page, None
+    last = page.iloc[-1]
+    return page, (int(last[column]), int(last['ID']))
+
+
+if __name__ == '__main__':
+    command = sys.argv[1:]
+    if command == ['migrate']:
+        migrate()
+        print(f"Schema ready ({get_backend().name})")
+    elif command == ['convert-legacy']:
+        print(f"Converted {convert_legacy()} user_data rows to the typed schema")
+    elif command == ['rebuild-rollup']:
+        rebuild_rollup()
+        print("Rebuilt user_data_rollup")
+    elif command == ['replay']:
+        # only spools no running app owns, a live writer drains its own
+        for path in (slot_path(Config.SPOOL_PATH, slot) for slot in range(MAX_SLOTS)):
+            if not os.path.exists(path):
+                continue
+            try:
+                spool = Spool(path)
+            except SpoolLocked:
+                print(f"Skipped {path}, a running process owns it")
+                continue
+            try:
+                replayed = spool.replay(insert_rows, Config.WRITE_BATCH_SIZE)
+            finally:
+                spool.close()
+            print(f"Replayed {replayed} rows from {path} into user_data")
+    else:
+        sys.exit("usage: python Database.py migrate|convert-legacy|rebuild-rollup|replay")
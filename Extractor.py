@@ -0,0 +1,163 @@
+import io
+import multiprocessing
+import os
+from functools import lru_cache
+from typing import List, NamedTuple
+
+import spacy
+from spacy.matcher import Matcher
+from pdfminer3.converter import PDFPageAggregator
+from pdfminer3.layout import LAParams, LTContainer, LTText, LTTextBox
+from pdfminer3.pdfdocument import PDFDocument
+from pdfminer3.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer3.pdfpage import PDFPage
+from pdfminer3.pdfparser import PDFParser
+from pdfminer3.pdftypes import resolve1
+
+import Config
+from Nlp import load_model
+
+
+# Result of the one and only pdfminer pass over an uploaded resume.
+# layouts is only filled by serial extraction, LTPage trees are too heavy to ship back from workers.
+class ExtractedResume(NamedTuple):
+    text: str
+    page_count: int
+    layouts: List
+
+
+def _render_text(item, out):
+    # Same traversal as pdfminer's TextConverter, so the text matches the old pdf_reader output
+    if isinstance(item, LTContainer):
+        for child in item:
+            _render_text(child, out)
+    elif isinstance(item, LTText):
+        out.append(item.get_text())
+    if isinstance(item, LTTextBox):
+        out.append('\n')
+
+
+# source is either a path on disk or the raw PDF bytes (bytes or memoryview)
+def _open_pdf(source):
+    return open(source, 'rb') if isinstance(source, str) else io.BytesIO(source)
+
+
+def _iter_layouts(source, pagenos=None):
+    resource_manager = PDFResourceManager()
+    device = PDFPageAggregator(resource_manager, laparams=LAParams())
+    interpreter = PDFPageInterpreter(resource_manager, device)
+    with _open_pdf(source) as fh:
+        for page in PDFPage.get_pages(fh, pagenos=pagenos, caching=True, check_extractable=True):
+            interpreter.process_page(page)
+            yield device.get_result()
+    device.close()
+
+
+def _page_text(layout):
+    chunks = []
+    _render_text(layout, chunks)
+    chunks.append('\f')
+    return ''.join(chunks)
+
+
+def _extract_serial(source):
+    texts, layouts = [], []
+    for layout in _iter_layouts(source):
+        texts.append(_page_text(layout))
+        layouts.append(layout)
+    return ExtractedResume(''.join(texts), len(layouts), layouts)
+
+
+# Runs in a worker process: layout analysis for one contiguous range of pages
+def _extract_page_range(source, start, stop):
+    return [_page_text(layout) for layout in _iter_layouts(source, set(range(start, stop)))]
+
+
+# Not fork: the app process already runs threads (Tornado, the script runner, the
+# user_data writer, upload saves) and a forked child can inherit a lock one of them held
+@lru_cache(maxsize=None)
+def _process_pool(workers):
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return context.Pool(workers)
+
+
+def count_pages(source):
+    # /Count of the page tree root, read from the xref without building any page
+    with _open_pdf(source) as fh:
+        try:
+            pages = resolve1(PDFDocument(PDFParser(fh)).catalog['Pages'])
+            return int(resolve1(pages['Count']))
+        except Exception:
+            # broken trailer or page tree, walk the pages like extraction will
+            fh.seek(0)
+            return sum(1 for _ in PDFPage.get_pages(fh))
+
+
+def _extract_parallel(source, page_count, workers):
+    if isinstance(source, memoryview):
+        # has to be pickled to the workers anyway
+        source = source.tobytes()
+    step = -(-page_count // workers)
+    pool = _process_pool(workers)
+    results = [pool.apply_async(_extract_page_range, (source, start, min(start + step, page_count)))
+               for start in range(0, page_count, step)]
+    texts = [text for result in results for text in result.get()]
+    # pages actually extracted, not the declared /Count: no_of_pages decides the candidate level
+    return ExtractedResume(''.join(texts), len(texts), [])
+
+
+def extract_pdf(source, workers=None):
+    workers = Config.EXTRACT_WORKERS if workers is None else workers
+    if workers > 1:
+        # short CVs are cheaper to parse serially than to fan out
+        page_count = count_pages(source)
+        if page_count >= Config.PARALLEL_MIN_PAGES:
+            return _extract_parallel(source, page_count, workers)
+    return _extract_serial(source)
+
+
+# pyresparser's own NER model (name, degree, designation, companies), a second set of
+# weights in every process, so it is only loaded when PARSER_CUSTOM_NER is on
+@lru_cache(maxsize=None)
+def _custom_ner_model():
+    import pyresparser
+    return spacy.load(os.path.dirname(os.path.abspath(pyresparser.__file__)))
+
+
+# pyresparser's ResumeParser field extraction, run on text we already have
+# instead of letting it open and parse the PDF again (twice, counting pages)
+def parse_resume(extracted, skills_file=None, custom_regex=None):
+    # pyresparser reads the NLTK stopwords at import, so only import it once they are known to be there
+    from pyresparser import utils
+    nlp = load_model()
+    text_raw = extracted.text
+    text = ' '.join(text_raw.split())
+    doc = nlp(text)
+    noun_chunks = list(doc.noun_chunks)
+
+    cust_ent = {}
+    if Config.PARSER_CUSTOM_NER:
+        cust_ent = utils.extract_entities_wih_custom_model(_custom_ner_model()(text_raw))
+    entities = utils.extract_entity_sections_grad(text_raw)
+
+    details = {
+        'name': None,
+        'email': utils.extract_email(text),
+        'mobile_number': utils.extract_mobile_number(text, custom_regex),
+        'skills': utils.extract_skills(doc, noun_chunks, skills_file),
+        'college_name': entities.get('College Name'),
+        'degree': cust_ent.get('Degree'),
+        'designation': cust_ent.get('Designation'),
+        'experience': entities.get('experience'),
+        'company_names': cust_ent.get('Companies worked at'),
+        'no_of_pages': extracted.page_count,
+        'total_experience': 0,
+    }
+    try:
+        details['name'] = cust_ent['Name'][0]
+    except (IndexError, KeyError):
+        details['name'] = utils.extract_name(doc, matcher=Matcher(nlp.vocab))
+    if details['experience']:
+        details['total_experience'] = round(utils.get_total_experience(details['experience']) / 12, 2)
+    return details
@@ -0,0 +1,71 @@
+from functools import lru_cache
+
+import spacy
+
+import Config
+
+# spaCy models are loaded lazily, once per process, and shared by whoever asks for them:
+# the resume parser and the summary both use the same en_core_web_sm instance.
+# (Streamlit reruns re-execute App.py but keep imported modules, so this survives reruns too.)
+
+
+@lru_cache(maxsize=None)
+def load_model(name=Config.SPACY_MODEL):
+    return spacy.load(name)
+
+
+# pdfminer text is mostly bullet lines without a final period, so a line break starts a new
+# sentence too, unless the next line starts in lowercase (a wrapped line of the same sentence)
+def _line_breaks(doc):
+    for token in doc[:-1]:
+        if '\n' in token.text:
+            following = doc[token.i + 1]
+            if not following.text[:1].islower():
+                following.is_sent_start = True
+    return doc
+
+
+@lru_cache(maxsize=None)
+def _sentencizer():
+    nlp = spacy.blank('en')
+    # the sentencizer keeps boundaries that are already set, so line breaks go first
+    nlp.add_pipe(_line_breaks, name='line_breaks')
+    nlp.add_pipe(nlp.create_pipe('sentencizer'))
+    return nlp
+
+
+# Run only some components of the shared model. Unlike nlp.disable_pipes() this
+# doesn't touch the pipeline, so it's safe while other threads use the full model.
+@lru_cache(maxsize=None)
+def _partial_pipeline(names):
+    nlp = load_model()
+    components = [component for name, component in nlp.pipeline if name in names]
+
+    def process(text):
+        doc = nlp.make_doc(text)
+        for component in components:
+            doc = component(doc)
+        return doc
+    return process
+
+
+# The summary only needs sentence boundaries: either rule-based punctuation splitting
+# or the dependency parser of the shared model with the tagger and NER skipped
+def summary_nlp(pipeline=None):
+    pipeline = pipeline or Config.SUMMARY_PIPELINE
+    if pipeline == 'sentencizer':
+        return _sentencizer()
+    if pipeline == 'parser':
+        return _partial_pipeline(('parser',))
+    if pipeline == 'full':
+        return load_model()
+    raise ValueError(f"Unknown summary pipeline: {pipeline}")
+
+
+# Docs for the summary one text at a time, so the caller can stop as soon as it has enough.
+# (Language.pipe would otherwise buffer a whole batch of texts before yielding anything.)
+def summary_docs(texts, pipeline=None):
+    nlp = summary_nlp(pipeline)
+    if hasattr(nlp, 'pipe'):
+        return nlp.pipe(texts, batch_size=1)
+    return map(nlp, texts)
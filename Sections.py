@@ -0,0 +1,76 @@
+import re
+
+# Resume segmentation: heading lines are found in one pass of a single compiled regex,
+# giving section name -> (start, end) offsets of the section body in the text. A heading line
+# is one or more of the phrases below joined by "&", "and", "/", "+" or ",", alone on its line
+# or followed by a colon ("Projects & Achievements", "Skills: Python, SQL"), so "skills" in
+# the middle of a sentence doesn't count. Text without a single heading line (pdfminer can run
+# a whole page into one line) falls back to capitalized phrases anywhere, see _compile.
+
+SECTION_HEADINGS = {
+    'Objective': ['career objective', 'objective', 'professional summary', 'career summary', 'summary',
+                  'profile', 'about me'],
+    'Achievements': ['achievements', 'accomplishments', 'awards', 'honors', 'honours'],
+    'Projects': ['projects', 'academic projects', 'personal projects', 'project details', 'project work'],
+    'Experience': ['experience', 'work experience', 'professional experience', 'employment history',
+                   'work history', 'internships', 'internship'],
+    'Skills': ['skills', 'technical skills', 'soft skills', 'key skills', 'skill set', 'core competencies',
+               'tools', 'technologies', 'tech stack'],
+    'Certifications': ['certifications', 'certification', 'certificates', 'courses', 'online courses', 'licenses'],
+    # not scored, but they end the section before them
+    'Education': ['education', 'academic background', 'academic details', 'qualifications'],
+    'Interests': ['interests', 'hobbies', 'hobbies and interests', 'extracurricular activities'],
+    'Languages': ['languages'],
+    'References': ['references'],
+}
+
+
+def _phrase(heading):
+    # pdfminer may put any run of spaces or tabs between the words of a heading
+    return r'[^\S\n]+'.join(re.escape(word) for word in heading.split())
+
+
+_JOINER = r'[^\S\n]*(?:&|\+|/|,|\band\b)[^\S\n]*'
+
+
+def _alternatives(phrases):
+    # longest first, so "work experience" wins over "experience"
+    return '|'.join(_phrase(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+
+
+def _compile(headings):
+    # up to 3 bullet/numbering characters, the joined phrases, then a colon or the end of the line
+    phrases = _alternatives([phrase for section_phrases in headings.values() for phrase in section_phrases])
+    any_heading = '(?:' + phrases + ')'
+    line = re.compile(r'^[^\w\n]{0,3}[^\S\n]*(?P<names>' + any_heading + '(?:' + _JOINER + any_heading + r')*)'
+                      r'[^\S\n]*(?::|$)', re.IGNORECASE | re.MULTILINE)
+    # fallback: a phrase starting with a capital at a word boundary, where a change of case counts
+    # as one since the spaces are usually gone too ("REST, SOAPSkillsNew York", "skills.SummaryEdu")
+    loose = re.compile(r'(?:(?<![A-Z])(?=[A-Z])|(?=[A-Z][a-z]))(?P<names>(?i:' + phrases + r'))(?![a-z])')
+    # which sections a matched heading line names, run on the heading only
+    names = re.compile('|'.join(f'(?P<{name}>{_alternatives(phrases)})' for name, phrases in headings.items()),
+                       re.IGNORECASE)
+    return line, loose, names
+
+
+HEADING_PATTERN, LOOSE_HEADING_PATTERN, HEADING_NAMES = _compile(SECTION_HEADINGS)
+
+
+def find_sections(text):
+    """Section name -> (start, end) of its body, in order of appearance.
+
+    A body runs from the end of its heading line to the start of the next one, every section
+    a combined heading names gets the same body. When a section shows up twice the first
+    one is kept. Without any heading line the loose phrase matches are the headings instead.
+    """
+    headings = []
+    matches = list(HEADING_PATTERN.finditer(text)) or LOOSE_HEADING_PATTERN.finditer(text)
+    for match in matches:
+        names = [name.lastgroup for name in HEADING_NAMES.finditer(match.group('names'))]
+        headings.append((names, match.start(), match.end()))
+    sections = {}
+    for i, (names, _, body_start) in enumerate(headings):
+        body_end = headings[i + 1][1] if i + 1 < len(headings) else len(text)
+        for name in names:
+            sections.setdefault(name, (body_start, body_end))
+    return sections
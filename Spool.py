@@ -0,0 +1,197 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:
+    # Windows dev machines
+    fcntl = None
+    import msvcrt
+
+log = logging.getLogger(__name__)
+
+# Append-only local spool of rows waiting to reach the database. Every row gets a unique
+# row_id and lands here before anything talks to MySQL, so a slow or dead DB never costs
+# the user their analysis. Appends are fsync'ed in groups (every fsync_every rows or
+# fsync_interval seconds). replay() sends rows from the last committed offset, and a crash
+# between the DB commit and the offset update just replays rows the DB ignores by row_id.
+# A spool belongs to one process at a time (an exclusive lock held while it's open), the
+# offset lives in that process's memory and a second reader would skip or tear rows.
+
+# replicas sharing a working directory each take the first free slot: user_data.jsonl,
+# user_data.1.jsonl, user_data.2.jsonl, ...
+MAX_SLOTS = 16
+
+
+class SpoolLocked(RuntimeError):
+    pass
+
+
+def slot_path(path, slot):
+    if not slot:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{slot}{ext}"
+
+
+def _try_lock(fh):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+class Spool:
+    def __init__(self, path, fsync_every=32, fsync_interval=0.5):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._offset_path = path + '.offset'
+        self._lock = threading.Lock()
+        # released by close() or when the process exits, however it exits
+        self._lock_file = open(path + '.lock', 'a+')
+        if not _try_lock(self._lock_file):
+            self._lock_file.close()
+            raise SpoolLocked(f"{path} is in use by another process")
+        self._drop_torn_tail()
+        self._file = open(path, 'ab')
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._offset = self._read_offset()
+        self._backlog = self._count_from(self._offset)
+
+    def _drop_torn_tail(self):
+        # a crash mid-append leaves a line without '\n', cut it so the next append starts clean
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as fh:
+            pos = fh.seek(0, os.SEEK_END)
+            if not pos:
+                return
+            fh.seek(pos - 1)
+            if fh.read(1) == b'\n':
+                return
+            while pos > 0:
+                step = min(4096, pos)
+                pos -= step
+                fh.seek(pos)
+                newline = fh.read(step).rfind(b'\n')
+                if newline >= 0:
+                    fh.truncate(pos + newline + 1)
+                    return
+            fh.truncate(0)
+
+    def _read_offset(self):
+        try:
+            with open(self._offset_path) as fh:
+                offset = int(fh.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+        return offset if offset <= os.path.getsize(self.path) else 0
+
+    def _write_offset(self, offset):
+        tmp_path = self._offset_path + '.tmp'
+        with open(tmp_path, 'w') as fh:
+            fh.write(str(offset))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self._offset_path)
+        self._offset = offset
+
+    def _count_from(self, offset):
+        with open(self.path, 'rb') as fh:
+            fh.seek(offset)
+            return sum(1 for _ in fh)
+
+    def _sync_locked(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def append(self, values):
+        line = json.dumps({'row_id': uuid.uuid4().hex, 'values': list(values)}) + '\n'
+        with self._lock:
+            self._file.write(line.encode('utf-8'))
+            self._file.flush()
+            self._unsynced += 1
+            self._backlog += 1
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync_locked()
+
+    def sync(self):
+        with self._lock:
+            if self._unsynced:
+                self._sync_locked()
+
+    def backlog(self):
+        return self._backlog
+
+    def replay(self, insert, batch_size=100):
+        # insert(rows) gets (values..., row_id) tuples and must ignore row_ids it already has
+        self.sync()
+        replayed = 0
+        with open(self.path, 'rb') as fh:
+            fh.seek(self._offset)
+            torn = False
+            while not torn:
+                rows, lines, end = [], 0, self._offset
+                while lines < batch_size:
+                    line = fh.readline()
+                    if not line.endswith(b'\n'):
+                        # an append still being written: leave it whole for the next replay
+                        fh.seek(end)
+                        torn = True
+                        break
+                    lines += 1
+                    end += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        log.error("Skipping unreadable spool line at offset %d", end - len(line))
+                        continue
+                    rows.append(tuple(record['values']) + (record['row_id'],))
+                if not lines:
+                    break
+                if rows:
+                    insert(rows)
+                with self._lock:
+                    self._write_offset(end)
+                    self._backlog -= lines
+                replayed += len(rows)
+        self._compact()
+        return replayed
+
+    def _compact(self):
+        with self._lock:
+            if self._offset and self._offset == self._file.tell():
+                # offset goes back to 0 first: a crash before the truncate only means a harmless replay
+                self._write_offset(0)
+                self._file.truncate(0)
+
+    def close(self):
+        with self._lock:
+            if self._unsynced:
+                self._sync_locked()
+            self._file.close()
+        self._lock_file.close()
+
+
+def open_spool(path, fsync_every=32, fsync_interval=0.5):
+    for slot in range(MAX_SLOTS):
+        try:
+            return Spool(slot_path(path, slot), fsync_every, fsync_interval)
+        except SpoolLocked:
+            continue
+    raise SpoolLocked(f"All {MAX_SLOTS} spool slots of {path} are in use")
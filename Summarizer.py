@@ -0,0 +1,71 @@
+import re
+
+import numpy as np
+from scipy import sparse
+
+# Extractive summary ranking, all matrix work: a sparse TF-IDF sentence matrix, cosine
+# similarities as one product, TextRank centrality by power iteration and an MMR pick
+# that trades centrality for novelty. Callers cap the number of sentences, so all of it
+# stays on small dense arrays (a few ms per resume).
+
+_TOKEN = re.compile(r"[a-z][a-z0-9+#]*")
+
+
+def tfidf_matrix(sentences):
+    """L2-normalized (sentences x terms) TF-IDF matrix with sublinear term frequency."""
+    vocabulary, indices, indptr = {}, [], [0]
+    for sentence in sentences:
+        for token in _TOKEN.findall(sentence.lower()):
+            indices.append(vocabulary.setdefault(token, len(vocabulary)))
+        indptr.append(len(indices))
+    counts = sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=(len(sentences), len(vocabulary)))
+    counts.sum_duplicates()
+    counts.data = 1 + np.log(counts.data)
+    df = np.bincount(counts.indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(sentences)) / (1 + df)) + 1
+    tfidf = counts @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ tfidf
+
+
+def textrank(similarity, damping=0.85, iterations=100, tol=1e-6):
+    n = similarity.shape[0]
+    weights = similarity.copy()
+    np.fill_diagonal(weights, 0)
+    totals = weights.sum(axis=1, keepdims=True)
+    totals[totals == 0] = 1
+    transition = weights / totals
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tol:
+            return updated
+        scores = updated
+    return scores
+
+
+def mmr(scores, similarity, k, diversity=0.3):
+    # greedy maximal marginal relevance: each pick is penalized by its closest earlier pick
+    chosen = np.zeros(len(scores), dtype=bool)
+    redundancy = np.zeros(len(scores))
+    picks = []
+    for _ in range(min(k, len(scores))):
+        gain = (1 - diversity) * scores - diversity * redundancy
+        gain[chosen] = -np.inf
+        best = int(np.argmax(gain))
+        picks.append(best)
+        chosen[best] = True
+        redundancy = np.maximum(redundancy, similarity[best])
+    return picks
+
+
+def rank_sentences(sentences, k, diversity=0.3):
+    """The k most central, least redundant sentences, in their original order."""
+    if len(sentences) <= k:
+        return list(sentences)
+    matrix = tfidf_matrix(sentences)
+    similarity = (matrix @ matrix.T).toarray()
+    scores = textrank(similarity)
+    picks = mmr(scores / scores.max(), similarity, k, diversity)
+    return [sentences[i] for i in sorted(picks)]
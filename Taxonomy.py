@@ -0,0 +1,176 @@
+import json
+import re
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+import Config
+
+# Skill taxonomy: canonical skills, their aliases and the career fields they count towards,
+# loaded from a JSON data file (SRA_TAXONOMY_PATH) and compiled once into an Aho-Corasick
+# automaton. A resume is scanned in one linear pass however many aliases the file holds.
+# Field scores are one sparse product: (resumes x skills) indicators times the
+# (skills x fields) weight matrix, the same code for one resume or a whole table of them.
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(text):
+    # pdfminer breaks lines anywhere, "machine\nlearning" must still match
+    return _WHITESPACE.sub(' ', text.lower())
+
+
+class SkillMatcher:
+    def __init__(self, aliases):
+        # aliases: normalized alias -> canonical skill
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for alias, skill in aliases.items():
+            node = 0
+            for char in alias:
+                if char not in self._goto[node]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[node][char] = len(self._goto) - 1
+                node = self._goto[node][char]
+            self._out[node].append((len(alias), skill))
+
+        # breadth first, so a node's fail target is always finished before the node itself
+        todo = deque(self._goto[0].values())
+        while todo:
+            node = todo.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                todo.append(child)
+
+    def scan(self, text):
+        """Yield (start, skill) for the leftmost-longest whole-word alias matches in normalized text.
+
+        Overlapping aliases don't all count: "react native" is React Native, not React as well,
+        and "spark sql" is Apache Spark only.
+        """
+        hits = sorted(self._hits(text), key=lambda hit: (hit[0], -hit[1]))
+        taken = 0
+        for start, end, skill in hits:
+            if start >= taken:
+                taken = end
+                yield start, skill
+
+    def _hits(self, text):
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, skill in out[node]:
+                start = end - length
+                # whole words only: "ux" must not match inside "linux", nor "js" inside "react.js"
+                if start and (text[start - 1].isalnum() or text[start - 1] == '.'):
+                    continue
+                if end < len(text) and text[end].isalnum():
+                    continue
+                yield start, end, skill
+
+
+class Taxonomy:
+    def __init__(self, fields, skills):
+        self.fields = list(fields)
+        self.skills = list(skills)
+        self.skill_index = {name: i for i, name in enumerate(self.skills)}
+        self.skill_fields = {name: list(entry.get('fields', [])) for name, entry in skills.items()}
+        unknown = {field for fields in self.skill_fields.values() for field in fields} - set(self.fields)
+        if unknown:
+            raise ValueError(f"Skills refer to fields missing from the taxonomy: {sorted(unknown)}")
+        self.aliases = {}
+        for name, entry in skills.items():
+            for alias in [name] + entry.get('aliases', []):
+                self.aliases[_normalize(alias).strip()] = name
+        self.matcher = SkillMatcher(self.aliases)
+
+        # skills x fields, a skill counts `weight` (1 by default) towards each of its fields
+        field_index = {field: j for j, field in enumerate(self.fields)}
+        rows, cols, weights = [], [], []
+        for i, name in enumerate(self.skills):
+            for field in self.skill_fields[name]:
+                rows.append(i)
+                cols.append(field_index[field])
+                weights.append(float(skills[name].get('weight', 1)))
+        self.weights = sparse.csr_matrix((weights, (rows, cols)), shape=(len(self.skills), len(self.fields)))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as fh:
+            data = json.load(fh)
+        return cls(data['fields'], data['skills'])
+
+    def match_counts(self, text):
+        """Canonical skill -> number of matches in text, in order of first appearance."""
+        counts = {}
+        for _, skill in self.matcher.scan(_normalize(text)):
+            counts[skill] = counts.get(skill, 0) + 1
+        return counts
+
+    def match(self, text):
+        """Canonical skills found in text, in order of first appearance."""
+        return list(self.match_counts(text))
+
+    def canonical(self, skill):
+        # any alias, in any case, as stored by the parser or typed by a user
+        return self.aliases.get(_normalize(skill).strip())
+
+    def skill_matrix(self, skill_lists):
+        """Sparse 0/1 (resumes x skills) matrix, skills that aren't in the taxonomy are dropped."""
+        indices, indptr = [], [0]
+        # stored skill names repeat a lot, normalize each distinct one once
+        columns = {}
+        for skill_list in skill_lists:
+            row = set()
+            for skill in skill_list:
+                if skill not in columns:
+                    name = self.canonical(skill)
+                    columns[skill] = None if name is None else self.skill_index[name]
+                if columns[skill] is not None:
+                    row.add(columns[skill])
+            indices.extend(sorted(row))
+            indptr.append(len(indices))
+        return sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=(len(indptr) - 1, len(self.skills)))
+
+    def field_scores(self, skill_lists):
+        """Dense (resumes x fields) array of field scores."""
+        return (self.skill_matrix(skill_lists) @ self.weights).toarray()
+
+    def field_hits(self, hit_counts):
+        """Dense (resumes x fields) array of weighted skill matches, from match_counts() dicts."""
+        rows, cols, counts = [], [], []
+        for i, skill_counts in enumerate(hit_counts):
+            for skill, count in skill_counts.items():
+                rows.append(i)
+                cols.append(self.skill_index[skill])
+                counts.append(count)
+        matrix = sparse.csr_matrix((counts, (rows, cols)), shape=(len(hit_counts), len(self.skills)))
+        return (matrix @ self.weights).toarray()
+
+    def top_fields(self, scores, k=3, hits=None):
+        # best k fields per row, fields without a single skill are left out. Ties go to the field
+        # with more matches in the text (hits, from field_hits()), then keep taxonomy order
+        if hits is None:
+            order = np.argsort(-scores, axis=1, kind='stable')[:, :k]
+        else:
+            order = np.lexsort((-hits, -scores), axis=1)[:, :k]
+        best = np.take_along_axis(scores, order, axis=1)
+        return [[(self.fields[j], score) for j, score in zip(columns, values) if score > 0]
+                for columns, values in zip(order.tolist(), best.tolist())]
+
+
+@lru_cache(maxsize=None)
+def get_taxonomy(path=Config.TAXONOMY_PATH):
+    return Taxonomy.load(path)
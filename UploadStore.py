@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import Config
+from Cache import content_digest
+
+# Content-addressed store for uploaded resumes: <root>/ab/cd/<sha256>.pdf.
+# Same bytes are stored once whatever the file was called, and an index next to the
+# shards tracks sizes and last use so the store stays under its byte/age budget
+# without ever listing the directories.
+
+
+class UploadStore:
+    def __init__(self, root=Config.UPLOAD_DIR, max_bytes=Config.UPLOAD_MAX_BYTES, max_age_days=Config.UPLOAD_MAX_AGE_DAYS):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, 'index.sqlite3'), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS uploads (
+                digest TEXT PRIMARY KEY, name TEXT, size INTEGER NOT NULL,
+                created REAL NOT NULL, last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS uploads_last_used ON uploads (last_used)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS uploads_created ON uploads (created)")
+        self.total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM uploads").fetchone()[0]
+
+    def path_for(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest + '.pdf')
+
+    def put(self, data, name=None, digest=None):
+        digest = digest or content_digest(data)
+        path = self.path_for(digest)
+        now = time.time()
+        with self._lock:
+            seen = self._conn.execute("UPDATE uploads SET last_used = ? WHERE digest = ?", (now, digest)).rowcount
+            if seen and os.path.exists(path):
+                return path
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write then rename, a crash never leaves a half-written PDF under its final name
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            if not seen:
+                self._conn.execute("INSERT INTO uploads VALUES (?, ?, ?, ?, ?)", (digest, name, len(data), now, now))
+                self.total_bytes += len(data)
+            self._evict(now)
+        return path
+
+    def get(self, digest):
+        with self._lock:
+            if not self._conn.execute("UPDATE uploads SET last_used = ? WHERE digest = ?", (time.time(), digest)).rowcount:
+                return None
+        return self.path_for(digest)
+
+    def _remove(self, rows):
+        for digest, size in rows:
+            try:
+                os.remove(self.path_for(digest))
+            except FileNotFoundError:
+                pass
+            self._conn.execute("DELETE FROM uploads WHERE digest = ?", (digest,))
+            self.total_bytes -= size
+
+    def _evict(self, now):
+        if self.max_age > 0:
+            self._remove(self._conn.execute(
+                "SELECT digest, size FROM uploads WHERE created < ?", (now - self.max_age,)).fetchall())
+        while self.total_bytes > self.max_bytes:
+            rows = self._conn.execute("SELECT digest, size FROM uploads ORDER BY last_used LIMIT 100").fetchall()
+            if not rows:
+                break
+            self._remove(rows)
+
+
+_store = None
+_store_lock = threading.Lock()
+_writer = ThreadPoolExecutor(max_workers=1)
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = UploadStore()
+    return _store
+
+
+# Keeping a copy of the uploaded PDF is a side effect, the analysis never reads it back,
+# so it happens on one background thread and the request path doesn't wait on the disk
+def save_upload_async(name, data, digest=None):
+    if Config.PERSIST_UPLOADS:
+        return _writer.submit(lambda: get_store().put(data, name, digest))
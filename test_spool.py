@@ -0,0 +1,51 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from Spool import Spool
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.spool = Spool(os.path.join(self.directory, 'user_data.jsonl'))
+
+    def tearDown(self):
+        self.spool.close()
+        shutil.rmtree(self.directory)
+
+    def test_append_in_progress_is_left_for_next_replay(self):
+        for i in range(3):
+            self.spool.append([i])
+        line = (json.dumps({'row_id': 'r3', 'values': [3]}) + '\n').encode('utf-8')
+        half = len(line) // 2
+        self.spool._file.write(line[:half])
+        self.spool._file.flush()
+
+        received = []
+
+        def insert(rows):
+            received.extend(rows)
+            if len(received) == 3:
+                # the 4th append finishes while the first batch is being inserted
+                self.spool._file.write(line[half:])
+                self.spool._file.flush()
+
+        with mock.patch('Spool.log') as log:
+            self.assertEqual(self.spool.replay(insert), 3)
+            self.assertEqual([row[0] for row in received], [0, 1, 2])
+            self.assertEqual(self.spool.replay(insert), 1)
+        log.error.assert_not_called()
+        self.assertEqual(received[-1], (3, 'r3'))
+
+        # everything replayed: the spool is compacted back to empty
+        self.assertEqual(os.path.getsize(self.spool.path), 0)
+        self.assertEqual(self.spool.replay(insert), 0)
+        self.assertEqual(len(received), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()